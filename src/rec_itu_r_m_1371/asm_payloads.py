@@ -27,9 +27,16 @@ limitations under the License.
 # =============================================================================
 # %% Import Statements
 # =============================================================================
-from bitstring import pack
+from functools import lru_cache
+
 from bitstring import BitStream
 
+from rec_itu_r_m_1371.bit_fields import (
+    parse_fmt,
+    pack_fields_to_bytes,
+    unpack_fields
+)
+
 # =============================================================================
 # %% Function Definitions
 # =============================================================================
@@ -68,6 +75,10 @@ class SampleASMPayload1:
         uint:10=dac, \
         uint:6=fi'
 
+    # Payload header fields, parsed from the format string once
+    _fields = parse_fmt(fmt)
+    _n_header_bits = sum(field[1] for field in _fields)
+
     def __init__(self, n_app_data_bytes=10):
         # Note that Rec. ITU-R M.1371 requires the data output to the VDL to be
         # byte-aligned.
@@ -86,8 +97,9 @@ class SampleASMPayload1:
         Raises
         ------
         ValueError
-            When an invalid DAC or FI are provided or the Application Data
-            portion of the bitstream is not byte-aligned.
+            When an invalid DAC or FI are provided, the bitstream is too short
+            or the Application Data portion of the bitstream is not
+            byte-aligned.
 
         Returns
         -------
@@ -95,15 +107,19 @@ class SampleASMPayload1:
             Test ASM Payload type 1 object.
 
         """
-        dac, fi, app_data_bs = bs.unpack(cls.fmt + ', bits')
+        # Only the header needs to be unpacked; the size of the Application
+        # Data follows from the bitstream length, without copying it out
+        d = unpack_fields(cls._fields, bs)
 
-        if (dac != cls.dac) or (fi != cls.fi):
+        if (d['dac'] != cls.dac) or (d['fi'] != cls.fi):
             raise ValueError("Invalid Application Identifier!")
 
-        if (len(app_data_bs) % 8) != 0:
+        n_app_data_bits = len(bs) - cls._n_header_bits
+
+        if (n_app_data_bits % 8) != 0:
             raise ValueError("Application Data is not byte-aligned!")
 
-        n_app_data_bytes = len(app_data_bs) // 8
+        n_app_data_bytes = n_app_data_bits // 8
 
         return cls(n_app_data_bytes)
 
@@ -118,18 +134,34 @@ class SampleASMPayload1:
             any particular standard; a sequence of all zeros is used
             for testing purposes.
 
+        """
+        # The payload only depends on the DAC, FI and Application Data size,
+        # so its bytes are shared between all payloads with the same values
+        bs = BitStream(bytes=self._payload_bytes(
+            self.dac, self.fi, self.n_app_data_bytes))
+
+        return bs
+
+    @classmethod
+    @lru_cache
+    def _payload_bytes(cls, dac, fi, n_app_data_bytes):
+        """
+        Return the payload as bytes.
+
+        The (immutable) result is cached, so that payloads with the same
+        DAC, FI and Application Data size are only encoded once.
+
         """
         # Construct the field name: value dictionary for the bit packing
-        d = {'dac': self.dac,
-             'fi': self.fi}
+        d = {'dac': dac,
+             'fi': fi}
 
-        # Create a bitstream using the message format and name: value dict
-        bs = pack(self.fmt, **d)
+        # Pack the (byte-aligned) header using the payload fields and
+        # name: value dict
+        header = pack_fields_to_bytes(cls._fields, **d)
 
         # Append the required number of zero bytes (the Application Data)
-        bs.append(BitStream(self.n_app_data_bytes * 8))
-
-        return bs
+        return header + bytes(n_app_data_bytes)
 
 # =============================================================================
 # %% Quick & Dirty Testing
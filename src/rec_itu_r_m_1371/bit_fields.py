@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Bit Fields Module.
+
+This module contains functions for packing message fields into bitstreams,
+and unpacking them, using pre-parsed message format strings.
+
+The message classes in this package describe their layout with bitstring
+format strings (e.g. 'uint:6=msg_id, uint:2=repeat_indicator, pad:2').
+Parsing such a string on every call to bitstring.pack() dominates the cost of
+encoding the (short) messages, so the format strings are parsed once, at
+class definition time, using parse_fmt(), and the resulting field list is
+then used by pack_fields(), pack_fields_to_bytes() or unpack_fields().
+
+The module also provides the EncodedBytesCache mixin, used by the message
+classes to avoid re-encoding messages whose fields have not changed.
+
+@author: Jan Safar
+
+Copyright 2024 GLA Research and Development Directorate
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+# =============================================================================
+# %% Import Statements
+# =============================================================================
+from bitstring import BitStream
+
+# =============================================================================
+# %% Function Definitions
+# =============================================================================
+def parse_fmt(fmt):
+    """
+    Parse a bitstring format string into a tuple of fields.
+
+    Only the subset of the bitstring format syntax used by the message
+    classes in this package is supported, i.e. comma-separated
+    'uint:<length>=<name>', 'int:<length>=<name>', 'bits:<length>=<name>'
+    and 'pad:<length>' tokens.
+
+    Parameters
+    ----------
+    fmt : str
+        Message format string.
+
+    Raises
+    ------
+    ValueError
+        When the format string contains an unsupported token.
+
+    Returns
+    -------
+    fields : tuple
+        Tuple of (type, length, name) tuples, one per token. The name is None
+        for padding fields.
+
+    """
+    fields = []
+    for token in fmt.split(','):
+        token = token.strip()
+        if not token:
+            continue
+
+        type_length, _, name = token.partition('=')
+        field_type, _, length = type_length.partition(':')
+        field_type = field_type.strip()
+        name = name.strip()
+
+        if (field_type not in ('uint', 'int', 'bits', 'pad')) \
+                or (not length.strip().isdigit()) \
+                or ((field_type == 'pad') == bool(name)):
+            raise ValueError("Unsupported format token: '{}'".format(token))
+
+        fields.append((field_type, int(length), name or None))
+
+    return tuple(fields)
+
+def _pack_fields_int(fields, kwargs):
+    """
+    Pack field values into an integer.
+
+    The field values are shifted and OR-ed into a single integer.
+
+    Returns
+    -------
+    value : int
+        Packed fields, as an unsigned integer (the first field occupies the
+        most significant bits).
+    n_bits : int
+        Total number of bits of the packed fields.
+
+    """
+    value = 0
+    n_bits = 0
+    for field_type, length, name in fields:
+        # Unsigned integer fields are by far the most common, hence checked
+        # first. Non-integer values (e.g. floats) are truncated, as by
+        # bitstring.pack().
+        if field_type == 'uint':
+            field_value = int(kwargs[name])
+            if (field_value < 0) or (field_value >> length):
+                raise ValueError(
+                    "Field '{}' does not fit into {:d} bits (unsigned)!".format(
+                        name, length))
+        elif field_type == 'int':
+            field_value = int(kwargs[name])
+            # Two's complement representation
+            if (field_value >> (length - 1)) not in (0, -1):
+                raise ValueError(
+                    "Field '{}' does not fit into {:d} bits (signed)!".format(
+                        name, length))
+            field_value &= (1 << length) - 1
+        elif field_type == 'bits':
+            field_value = kwargs[name]
+            if isinstance(field_value, int):
+                if (field_value < 0) or (field_value >> length):
+                    raise ValueError(
+                        "Field '{}' does not fit into {:d} bits!".format(
+                            name, length))
+            elif len(field_value) != length:
+                raise ValueError(
+                    "Field '{}' must be {:d} bits long!".format(name, length))
+            else:
+                field_value = field_value.uint
+        else:
+            field_value = 0
+
+        value = (value << length) | field_value
+        n_bits += length
+
+    return value, n_bits
+
+def pack_fields(fields, **kwargs):
+    """
+    Pack field values into a bitstream.
+
+    The field values are shifted and OR-ed into a single integer, which is
+    then converted to a bitstream in one go (via bytes, if the total length
+    is a whole number of bytes, which is the case for all AIS messages).
+
+    Parameters
+    ----------
+    fields : tuple
+        Fields, as returned by parse_fmt().
+    **kwargs
+        Field name: value pairs. Values of 'uint' and 'int' fields are
+        truncated to integers. Values of 'bits' fields must be either
+        bitstrings of the specified length or unsigned integers holding the
+        raw field bits.
+
+    Raises
+    ------
+    ValueError
+        When a field value does not fit into the specified number of bits.
+
+    Returns
+    -------
+    bs : bitstring.BitStream
+        Packed bitstream.
+
+    """
+    value, n_bits = _pack_fields_int(fields, kwargs)
+
+    if n_bits == 0:
+        return BitStream()
+
+    if n_bits % 8 == 0:
+        return BitStream(bytes=value.to_bytes(n_bits // 8, 'big'))
+
+    return BitStream(uint=value, length=n_bits)
+
+def pack_fields_to_bytes(fields, **kwargs):
+    """
+    Pack field values into a bytes object.
+
+    Intended for packing byte-aligned message headers, which can then be
+    concatenated with the rest of the message before converting it to a
+    bitstream.
+
+    Parameters
+    ----------
+    fields : tuple
+        Fields, as returned by parse_fmt().
+    **kwargs
+        Field name: value pairs, as for pack_fields().
+
+    Raises
+    ------
+    ValueError
+        When a field value does not fit into the specified number of bits or
+        the total length of the fields is not a whole number of bytes.
+
+    Returns
+    -------
+    bytes
+        Packed fields.
+
+    """
+    value, n_bits = _pack_fields_int(fields, kwargs)
+
+    if n_bits % 8 != 0:
+        raise ValueError("Fields are not byte-aligned!")
+
+    return value.to_bytes(n_bits // 8, 'big')
+
+def unpack_fields(fields, bs):
+    """
+    Unpack field values from a bitstream.
+
+    The bitstream is read as a single integer, from which the field values
+    are then extracted by shifting and masking. Any bits beyond the fields
+    are ignored.
+
+    Parameters
+    ----------
+    fields : tuple
+        Fields, as returned by parse_fmt().
+    bs : bitstring.Bits
+        Bitstream to unpack (read from the start, irrespective of its current
+        position).
+
+    Raises
+    ------
+    ValueError
+        When the bitstream is shorter than the fields.
+
+    Returns
+    -------
+    values : dict
+        Field name: value pairs (padding fields are skipped). Values of 'bits'
+        fields are returned as unsigned integers holding the raw field bits.
+
+    """
+    n_bits = sum(length for _, length, _ in fields)
+    if len(bs) < n_bits:
+        raise ValueError("Bitstream is too short!")
+
+    if n_bits == 0:
+        return {}
+
+    value = (bs if len(bs) == n_bits else bs[:n_bits]).uint
+
+    values = {}
+    shift = n_bits
+    for field_type, length, name in fields:
+        shift -= length
+        if name is None:
+            continue
+
+        field_value = (value >> shift) & ((1 << length) - 1)
+        if (field_type == 'int') and (field_value >> (length - 1)):
+            # Sign extension
+            field_value -= 1 << length
+        values[name] = field_value
+
+    return values
+
+
+# =============================================================================
+# %% Class Definitions
+# =============================================================================
+class EncodedBytesCache:
+    """
+    Mixin caching the encoded bytes of a message, keyed on its field values.
+
+    Subclasses implement _encoding_key(), returning a tuple of all the values
+    the encoding depends on, and _encode_bytes(), returning the encoded
+    message. _cached_bytes() only calls _encode_bytes() if the key has changed
+    since the previous call, so modifications to the message (including
+    in-place ones) are picked up without any attribute assignment hooks.
+
+    Keys are compared with ==, so values that compare equal (e.g. 60 and
+    60.0) must also encode identically. This holds for integer fields, whose
+    values are truncated to integers when packed.
+
+    """
+    _bytes_cache = None
+
+    def _cached_bytes(self):
+        """
+        Return the encoded message, re-encoding it only if required.
+
+        """
+        key = self._encoding_key()
+        cache = self._bytes_cache
+        if (cache is None) or (cache[0] != key):
+            cache = (key, self._encode_bytes())
+            self._bytes_cache = cache
+
+        return cache[1]
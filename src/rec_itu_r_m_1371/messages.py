@@ -28,11 +28,155 @@ limitations under the License.
 # =============================================================================
 # %% Import Statements
 # =============================================================================
-from bitstring import BitStream, pack
+from bitstring import BitStream
+
+from rec_itu_r_m_1371.bit_fields import (
+    parse_fmt,
+    pack_fields_to_bytes,
+    unpack_fields,
+    EncodedBytesCache
+)
+
+# =============================================================================
+# %% Constants
+# =============================================================================
+# Translation table from 8-bit ASCII to 6-bit ASCII character codes (0-63).
+# Lower-case letters are mapped to the codes of their upper-case equivalents.
+_AIS_8B_TO_6B = bytes(((c - 32) if 97 <= c <= 122 else c) & 0x3F
+                      for c in range(256))
+# 8-bit ASCII characters that cannot be represented in 6-bit ASCII
+_AIS_8B_INVALID = bytes(c for c in range(256)
+                        if not ((32 <= c <= 95) or (97 <= c <= 122)))
+
+# Minimum string length (in characters) for which 6-bit ASCII characters are
+# packed using _ais_6b_bulk_pack() rather than one by one
+_AIS_6B_BULK_PACK_MIN_CHARS = 64
+
+# Translation table from 6-bit ASCII character codes (0-63) to 8-bit ASCII.
+# bytes.translate() requires a 256-entry table; codes above 63 cannot occur.
+_AIS_6B_TO_8B = bytes(range(64, 96)) + bytes(range(32, 64)) + bytes(192)
 
 # =============================================================================
 # %% Function Definitions
 # =============================================================================
+def _ais_6b_bulk_pack(ais_chars):
+    """
+    Pack 6-bit ASCII character codes into an int, four characters at a time.
+
+    Characters are processed in groups of four, each of which is packed into
+    three bytes. The n-th characters of all the groups are treated as the
+    8-bit lanes of a single integer, so that every step of the packing is
+    performed on all groups at once, by a few big-integer operations, rather
+    than character by character.
+
+    Parameters
+    ----------
+    ais_chars : bytes
+        6-bit ASCII character codes (0-63), one per byte.
+
+    Returns
+    -------
+    ais_int : int
+        Packed characters, as an unsigned integer (the first character
+        occupies the most significant bits).
+
+    """
+    # Pad the input to a whole number of groups with zeros
+    n_pad = -len(ais_chars) % 4
+    ais_chars += bytes(n_pad)
+    n_groups = len(ais_chars) // 4
+
+    # 1st, 2nd, 3rd and 4th characters of each group (aaaaaa, bbbbbb,
+    # cccccc, dddddd), one group per 8-bit lane
+    a, b, c, d = (int.from_bytes(ais_chars[i::4], 'big') for i in range(4))
+
+    # Masks clearing any bits shifted into a lane from its neighbour
+    mask_0f = int.from_bytes(b'\x0f' * n_groups, 'big')
+    mask_03 = int.from_bytes(b'\x03' * n_groups, 'big')
+
+    # Interleave the packed bytes (aaaaaabb, bbbbcccc, ccdddddd)
+    packed = bytearray(3 * n_groups)
+    packed[0::3] = ((a << 2) | ((b >> 4) & mask_0f)).to_bytes(n_groups, 'big')
+    packed[1::3] = (((b & mask_0f) << 4) | ((c >> 2) & mask_0f)).to_bytes(
+        n_groups, 'big')
+    packed[2::3] = (((c & mask_03) << 6) | d).to_bytes(n_groups, 'big')
+
+    # Drop the padding
+    return int.from_bytes(packed, 'big') >> (6 * n_pad)
+
+def _ais_ascii_8b_to_6b_chars(ascii_8b):
+    """
+    Convert an 8-bit ASCII-encoded string to 6-bit ASCII character codes.
+
+    Parameters
+    ----------
+    ascii_8b : str
+        Input string encoded in 8-bit ASCII.
+
+    Returns
+    -------
+    ais_chars : bytes
+        6-bit ASCII character codes (0-63), one per byte.
+
+    """
+    # Convert the whole string to ASCII codes and then to 6-bit ASCII codes
+    # in one go, using a translation table, which also takes care of the
+    # conversion to upper case. Characters that cannot be represented in
+    # 6-bit ASCII are dropped.
+    return ascii_8b.encode('ascii', 'ignore').translate(
+        _AIS_8B_TO_6B, _AIS_8B_INVALID)
+
+def _ais_6b_pack(ais_chars):
+    """
+    Pack 6-bit ASCII character codes into an int.
+
+    Parameters
+    ----------
+    ais_chars : bytes
+        6-bit ASCII character codes (0-63), one per byte.
+
+    Returns
+    -------
+    ais_int : int
+        Packed characters, as an unsigned integer (the first character
+        occupies the most significant bits).
+
+    """
+    # Accumulate the 6-bit characters into a single integer, rather than
+    # appending them to a bitstream one by one. The character-by-character
+    # loop is quadratic in the string length, so long strings are packed
+    # using bulk integer operations instead.
+    if len(ais_chars) >= _AIS_6B_BULK_PACK_MIN_CHARS:
+        return _ais_6b_bulk_pack(ais_chars)
+
+    ais_int = 0
+    for ais_char in ais_chars:
+        ais_int = (ais_int << 6) | ais_char
+
+    return ais_int
+
+def _ais_ascii_8b_to_6b_int(ascii_8b):
+    """
+    Convert an 8-bit ASCII-encoded string to 6-bit ASCII, packed into an int.
+
+    Parameters
+    ----------
+    ascii_8b : str
+        Input string encoded in 8-bit ASCII.
+
+    Returns
+    -------
+    ais_int : int
+        Input string encoded in 6-bit ASCII, as an unsigned integer (the
+        first character occupies the most significant bits).
+    n_bits : int
+        Number of bits of the encoded string.
+
+    """
+    ais_chars = _ais_ascii_8b_to_6b_chars(ascii_8b)
+
+    return _ais_6b_pack(ais_chars), 6 * len(ais_chars)
+
 def ais_ascii_8b_to_6b(ascii_8b):
     """
     Convert an 8-bit ASCII-encoded string to a 6-bit ASCII encoded bitstream.
@@ -50,18 +194,38 @@ def ais_ascii_8b_to_6b(ascii_8b):
         Input string encoded in 6-bit ASCII.
 
     """
-    bs = BitStream()
-    ascii_8b = ascii_8b.__str__().upper()
-    for c in ascii_8b:
-        ascii_ord = ord(c)
-        if (ascii_ord >= 32) & (ascii_ord <= 63):
-            ais_ord = ascii_ord
-            bs.append('uint:6=' + str(ais_ord))
-        elif (ascii_ord >= 64) & (ascii_ord <= 95):
-            ais_ord = ascii_ord - 64
-            bs.append('uint:6=' + str(ais_ord))
-
-    return bs
+    ais_int, n_bits = _ais_ascii_8b_to_6b_int(ascii_8b)
+
+    if n_bits == 0:
+        return BitStream()
+
+    return BitStream(uint=ais_int, length=n_bits)
+
+def _ais_ascii_6b_int_to_8b(ais_int, n_char):
+    """
+    Convert 6-bit ASCII, packed into an int, to an 8-bit ASCII-encoded string.
+
+    Parameters
+    ----------
+    ais_int : int
+        String encoded in 6-bit ASCII, as an unsigned integer (the first
+        character occupies the most significant bits).
+    n_char : int
+        Number of characters.
+
+    Returns
+    -------
+    ascii_8b : str
+        String encoded in 8-bit ASCII.
+
+    """
+    # Split the integer up into 6-bit characters
+    ais_chars = bytes((ais_int >> shift) & 0x3F
+                      for shift in range(6 * (n_char - 1), -1, -6))
+
+    # Map 0-31 to 64-95 and leave 32-63 as is, using a translation table
+    # rather than a per-character conditional
+    return ais_chars.translate(_AIS_6B_TO_8B).decode('ascii')
 
 def ais_ascii_6b_to_8b(bs):
     """
@@ -83,17 +247,22 @@ def ais_ascii_6b_to_8b(bs):
     # TODO: Add some input testing to see if the bitstream len is divisible by 6
 
     n_char = len(bs) // 6
-    char_lst = bs.readlist(n_char*'uint:6, ')
+    if n_char == 0:
+        return ""
 
-    char_lst[:] = [char + 64 if char < 32 else char for char in char_lst]
+    # Read all the 6-bit characters as a single integer and convert them.
+    # Any trailing bits are sliced off (which copies the bitstream) only if
+    # present.
+    if len(bs) != n_char * 6:
+        bs = bs[:n_char * 6]
 
-    return "".join(map(chr, char_lst))
+    return _ais_ascii_6b_int_to_8b(bs.uint, n_char)
 
 
 # =============================================================================
 # %% Class Definitions
 # =============================================================================
-class AISMessage8:
+class AISMessage8(EncodedBytesCache):
     """
     AIS Message 8: Binary broadcast message, as per Rec. ITU-R M.1371-5.
 
@@ -116,6 +285,9 @@ class AISMessage8:
         uint:30=source_id, \
         pad:2'
 
+    # Message fields, parsed from the format string once
+    _fields = parse_fmt(fmt)
+
     def __init__(self, source_id, payload):
         self.source_id = source_id
         self.payload = payload
@@ -145,31 +317,54 @@ class AISMessage8:
         Return the message bitstream, formatted as per ITU-R M.1371-5
 
         """
+        # The (byte-aligned) message header is only re-packed if any of its
+        # fields have changed
+        header = self._cached_bytes()
+
+        # Append the payload. Payloads are normally byte-aligned, in which
+        # case the whole message is assembled as bytes and converted to a
+        # bitstream in one go.
+        payload_bs = self.payload.bitstream
+        if len(payload_bs) % 8 == 0:
+            bs = BitStream(bytes=header + payload_bs.tobytes())
+        else:
+            bs = BitStream(bytes=header) + payload_bs
+
+        return bs
+
+    def _encoding_key(self):
+        return (self.msg_id, self.repeat_indicator, self.source_id)
+
+    def _encode_bytes(self):
         # Construct the field name: value dictionary for the bit packing
         d = {'msg_id': self.msg_id,
              'repeat_indicator': self.repeat_indicator,
              'source_id': self.source_id}
 
-        # Create a bitstream using the message format and name: value dict.
-        bs = pack(self.fmt, **d)
-
-        # Append the payload bitstream
-        bs += self.payload.bitstream
-
-        return bs
+        # Pack the header using the message fields and name: value dict.
+        return pack_fields_to_bytes(self._fields, **d)
 
     def __str__(self):
+        # The payload bitstream is read on every call, so that the output
+        # reflects any changes made to the payload. For byte-aligned payloads,
+        # the hex string is produced by bytes.hex().
+        payload_bs = self.payload.bitstream
+        if len(payload_bs) % 8 == 0:
+            payload_hex = payload_bs.tobytes().hex()
+        else:
+            payload_hex = payload_bs.hex
+
         s = """
 
     AIS Message 8: Binary Broadcast Message
     ---------------------------------------
     Source ID: {:d}
-    Binary Data: 0x{:s}""".format(self.source_id, self.payload.bitstream.hex)
+    Binary Data: 0x{:s}""".format(self.source_id, payload_hex)
 
         return s
 
 
-class AISMessage21:
+class AISMessage21(EncodedBytesCache):
     """
     AIS Message 21: AtoN report, as per Rec. ITU-R M.1371-4?5.
 
@@ -184,7 +379,8 @@ class AISMessage21:
     aton_type : int
         Type of AtoN (0-31).
     aton_name : str
-        Name of AtoN (up to 20 characters).
+        Name of AtoN (up to 20 characters; any further characters are
+        ignored when encoding the message).
     pos_accuracy : int
         Position accuracy (0-1).
     lon : float
@@ -238,6 +434,9 @@ class AISMessage21:
         uint:1=assigned_mode_fl, \
         pad:1'
 
+    # Message fields, parsed from the format string once
+    _fields = parse_fmt(fmt)
+
     def __init__(
             self,
             source_id,
@@ -272,6 +471,11 @@ class AISMessage21:
         self.assigned_mode_fl = assigned_mode_fl
         self.aton_name_extension = aton_name_extension
 
+        # (AtoN name, raw 6-bit AtoN name field) pair, set when the message is
+        # decoded from a bitstream, so that the AtoN name does not need to be
+        # re-encoded unless it has been changed
+        self._aton_name_raw = None
+
     @classmethod
     def from_bitstream(cls, bs):
         """
@@ -288,53 +492,164 @@ class AISMessage21:
             AIS Message 21 object.
 
         """
-        # Unpack the bitstream using the class' format string
-        msg_id, repeat_indicator, source_id, aton_type, aton_name, pos_accuracy, \
-        lon, lat, dimension_A, dimension_B, dimension_C, dimension_D, \
-        epf_device_type, time_stamp, off_position, aton_status, raim_fl, \
-        vaton_fl, assigned_mode_fl = bs.unpack(cls.fmt)
+        # Unpack the bitstream using the class' message fields
+        fields = unpack_fields(cls._fields, bs)
 
         # Pre-process any input variables as required
-        aton_name = ais_ascii_6b_to_8b(aton_name)
+        aton_name_raw = fields['aton_name']
+        aton_name = _ais_ascii_6b_int_to_8b(aton_name_raw, 20)
         aton_name_extension = ""
-        lon = lon / 600000.0
-        lat = lat / 600000.0
+        lon = fields['lon'] / 600000.0
+        lat = fields['lat'] / 600000.0
 
-        return cls(
-            source_id,
-            aton_type,
+        msg = cls(
+            fields['source_id'],
+            fields['aton_type'],
             aton_name,
-            pos_accuracy,
+            fields['pos_accuracy'],
             lon,
             lat,
-            [dimension_A, dimension_B, dimension_C, dimension_D],
-            epf_device_type,
-            time_stamp,
-            off_position,
-            aton_status,
-            raim_fl,
-            vaton_fl,
-            assigned_mode_fl,
+            [fields['dimension_A'], fields['dimension_B'],
+             fields['dimension_C'], fields['dimension_D']],
+            fields['epf_device_type'],
+            fields['time_stamp'],
+            fields['off_position'],
+            fields['aton_status'],
+            fields['raim_fl'],
+            fields['vaton_fl'],
+            fields['assigned_mode_fl'],
             aton_name_extension)
 
+        msg._aton_name_raw = (aton_name, aton_name_raw)
+
+        return msg
+
     @property
     def bitstream(self):
         """
         Returns
         -------
         bs : bitstring.BitStream
-            Message bitstream, formatted as per Rec. ITU-R M.1371-4?5
+            Message bitstream, formatted as per Rec. ITU-R M.1371-4?5.
+
+            The encoded message is cached and only re-encoded if any of the
+            message fields have changed; a new bitstream object is returned
+            on every access.
 
         """
-        # Pre-process any member variables as required
-        aton_name = self.aton_name.__str__().ljust(20, '@')
+        return BitStream(bytes=self._cached_bytes())
+
+    def _encoding_key(self):
+        return (self.msg_id, self.repeat_indicator, self.source_id,
+                self.aton_type, self.aton_name, self.pos_accuracy, self.lon,
+                self.lat, tuple(self.dimension), self.epf_device_type,
+                self.time_stamp, self.off_position, self.aton_status,
+                self.raim_fl, self.vaton_fl, self.assigned_mode_fl)
+
+    def _encode_bytes(self):
+        # Pre-process any member variables as required. The AtoN name is
+        # passed to the packer as an integer, avoiding an intermediate
+        # bitstream.
+        if (self._aton_name_raw is not None) \
+                and (self._aton_name_raw[0] == self.aton_name):
+            # Reuse the raw field of a decoded message with an unchanged name
+            aton_name = self._aton_name_raw[1]
+        else:
+            aton_name = _ais_6b_pack(self._aton_name_chars(self.aton_name))
+
+        # Pack the message using the message fields and name: value dict.
+        return pack_fields_to_bytes(
+            self._fields, **self._field_values(aton_name))
 
-        # Construct the field name: value dictionary for the bit packing
+    @classmethod
+    def encode_batch(cls, msgs):
+        """
+        Encode a batch of AIS Message 21 objects.
+
+        The AtoN names of all the messages are converted to 6-bit ASCII
+        together, in one pass, and the encoded messages are written into a
+        single preallocated buffer. Messages whose cached encoding is up to
+        date are copied from their cache instead; the caches of the other
+        messages are left as they are.
+
+        Parameters
+        ----------
+        msgs : iterable of AISMessage21
+            Messages to encode.
+
+        Returns
+        -------
+        frames : bytearray
+            The encoded messages, concatenated. Each message is 272 bits
+            (34 bytes) long, i.e. message i occupies bytes 34*i to 34*(i+1).
+
+        """
+        msgs = list(msgs)
+        frames = bytearray(34 * len(msgs))
+
+        # Messages with an up-to-date cached encoding (e.g. ones whose
+        # bitstream has already been read) are copied from the cache
+        to_encode = []
+        for i, msg in enumerate(msgs):
+            cache = msg._bytes_cache
+            if (cache is not None) and (cache[0] == msg._encoding_key()):
+                frames[34*i:34*(i + 1)] = cache[1]
+            else:
+                to_encode.append(i)
+
+        # Convert the AtoN names of the remaining messages to 6-bit ASCII and
+        # pack them all at once, 15 bytes per name. The raw AtoN name fields
+        # of decoded messages are not reused, as re-encoding the decoded
+        # names gives the same fields.
+        ais_chars = b"".join(
+            cls._aton_name_chars(msgs[i].aton_name) for i in to_encode)
+        aton_names = _ais_6b_bulk_pack(ais_chars).to_bytes(
+            15 * len(to_encode), 'big')
+
+        for j, i in enumerate(to_encode):
+            aton_name = int.from_bytes(aton_names[15*j:15*(j + 1)], 'big')
+            frames[34*i:34*(i + 1)] = pack_fields_to_bytes(
+                cls._fields, **msgs[i]._field_values(aton_name))
+
+        return frames
+
+    @staticmethod
+    def _aton_name_chars(aton_name):
+        """
+        Return the 6-bit ASCII character codes of the AtoN name field.
+
+        The name is truncated to 20 characters and padded with '@'
+        characters (code 0) to 20 characters.
+
+        Parameters
+        ----------
+        aton_name : str
+            Name of AtoN.
+
+        Returns
+        -------
+        ais_chars : bytes
+            20 6-bit ASCII character codes (0-63), one per byte.
+
+        """
+        return _ais_ascii_8b_to_6b_chars(aton_name[:20]).ljust(20, b"\x00")
+
+    def _field_values(self, aton_name):
+        """
+        Return the field name: value dictionary for the bit packing.
+
+        Parameters
+        ----------
+        aton_name : int
+            The AtoN name field (6-bit ASCII, padded to 120 bits), as an
+            unsigned integer.
+
+        """
         d = {'msg_id': self.msg_id,
              'repeat_indicator': self.repeat_indicator,
              'source_id': self.source_id,
              'aton_type': self.aton_type,
-             'aton_name': ais_ascii_8b_to_6b(aton_name),
+             'aton_name': aton_name,
              'pos_accuracy': self.pos_accuracy,
              'lon': int(round(self.lon*600000)),
              'lat': int(round(self.lat*600000)),
@@ -350,11 +665,7 @@ class AISMessage21:
              'vaton_fl': self.vaton_fl,
              'assigned_mode_fl': self.assigned_mode_fl}
 
-        # Create a bitstream using the message format string and name: value
-        # dict.
-        bs = pack(self.fmt, **d)
-
-        return bs
+        return d
 
     def __str__(self):
         s = """
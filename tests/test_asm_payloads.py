@@ -72,6 +72,11 @@ def test_sample_asm_payload_1_from_bitstream():
     with pytest.raises(ValueError, match="Invalid Application Identifier!"):
         SampleASMPayload1.from_bitstream(invalid_bs)
 
+    # Bitstream too short
+    invalid_bs = BitStream("0x000")
+    with pytest.raises(ValueError, match="Bitstream is too short!"):
+        SampleASMPayload1.from_bitstream(invalid_bs)
+
     # Bitstream not byte-aligned
     invalid_bs = BitStream("0x00010")
     with pytest.raises(ValueError, match="Application Data is not byte-aligned!"):
@@ -94,6 +99,19 @@ def test_sample_asm_payload_1_bitstream():
     # Check if the Application Data portion is byte-aligned
     assert bs.read('bits') == '0b00000000' * n_app_data_bytes
 
+    # Every access returns a new bitstream, reflecting any changes to the
+    # payload
+    assert asm_payload.bitstream is not bs
+    assert asm_payload.bitstream.pos == 0
+
+    asm_payload.n_app_data_bytes = 2
+    assert asm_payload.bitstream == '0x00010000'
+
+    # Payloads of the same size have equal, but independent, bitstreams
+    bs_2 = SampleASMPayload1(n_app_data_bytes=2).bitstream
+    assert bs_2 == asm_payload.bitstream
+    assert bs_2 is not asm_payload.bitstream
+
 # =============================================================================
 # %% Main Function
 # =============================================================================
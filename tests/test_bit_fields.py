@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Test Bit Fields Module.
+
+This module contains test cases for the bit_fields.py Module.
+
+@author: Jan Safar
+
+Copyright 2024 GLA Research and Development Directorate
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+# =============================================================================
+# %% Import Statements
+# =============================================================================
+# Built-in Modules ------------------------------------------------------------
+
+# Third-party Modules ---------------------------------------------------------
+import pytest
+from bitstring import BitStream, pack
+
+# Local Modules ---------------------------------------------------------------
+from rec_itu_r_m_1371.bit_fields import (
+    parse_fmt,
+    pack_fields,
+    pack_fields_to_bytes,
+    unpack_fields
+)
+
+# =============================================================================
+# %% Sample Data
+# =============================================================================
+fmt = '\
+    uint:6=msg_id, \
+    int:9=offset, \
+    bits:12=name, \
+    pad:5'
+
+d = {'msg_id': 21,
+     'offset': -123,
+     'name': BitStream('0xABC')}
+
+# =============================================================================
+# %% Test Cases
+# =============================================================================
+def test_parse_fmt():
+    fields = parse_fmt(fmt)
+    assert fields == (('uint', 6, 'msg_id'),
+                      ('int', 9, 'offset'),
+                      ('bits', 12, 'name'),
+                      ('pad', 5, None))
+
+    # Unsupported tokens
+    with pytest.raises(ValueError, match="Unsupported format token"):
+        parse_fmt('float:32=x')
+
+    with pytest.raises(ValueError, match="Unsupported format token"):
+        parse_fmt('uint=x')
+
+    with pytest.raises(ValueError, match="Unsupported format token"):
+        parse_fmt('uint:6')
+
+def test_pack_fields():
+    fields = parse_fmt(fmt)
+
+    # The result must match what bitstring.pack() produces
+    assert pack_fields(fields, **d) == pack(fmt, **d)
+
+    assert pack_fields(()) == BitStream()
+
+    # 'bits' fields can also be specified as raw integers
+    assert pack_fields(fields, **(d | {'name': 0xABC})) == pack(fmt, **d)
+
+    # Float values of integer fields are truncated, as by bitstring.pack()
+    d_float = d | {'msg_id': 21.7, 'offset': -123.9}
+    assert pack_fields(fields, **d_float) == pack(fmt, **d_float)
+
+    # Byte-aligned and non-byte-aligned results
+    assert pack_fields(parse_fmt('uint:16=a'), a=0x1234) == BitStream('0x1234')
+    assert pack_fields(parse_fmt('uint:12=a'), a=0x123) == BitStream('0x123')
+
+    # Field values that do not fit
+    with pytest.raises(ValueError, match="'msg_id' does not fit"):
+        pack_fields(fields, **(d | {'msg_id': 64}))
+
+    with pytest.raises(ValueError, match="'offset' does not fit"):
+        pack_fields(fields, **(d | {'offset': -257}))
+
+    with pytest.raises(ValueError, match="'name' must be 12 bits long"):
+        pack_fields(fields, **(d | {'name': BitStream('0xAB')}))
+
+    with pytest.raises(ValueError, match="'name' does not fit"):
+        pack_fields(fields, **(d | {'name': 0x1000}))
+
+def test_pack_fields_to_bytes():
+    result = pack_fields_to_bytes(parse_fmt(fmt), **d)
+    assert result == pack(fmt, **d).tobytes()
+
+    # Fields that are not byte-aligned
+    with pytest.raises(ValueError, match="Fields are not byte-aligned!"):
+        pack_fields_to_bytes(parse_fmt('uint:6=msg_id'), msg_id=21)
+
+def test_unpack_fields():
+    fields = parse_fmt(fmt)
+    bs = pack(fmt, **d)
+
+    assert unpack_fields(fields, bs) == d | {'name': 0xABC}
+
+    # Trailing bits are ignored
+    assert unpack_fields(fields, bs + '0xF') == d | {'name': 0xABC}
+
+    # Bitstream too short
+    with pytest.raises(ValueError, match="Bitstream is too short!"):
+        unpack_fields(fields, bs[:-1])
+
+# =============================================================================
+# %% Main Function
+# =============================================================================
+if __name__ == '__main__':
+    pytest.main()
@@ -25,6 +25,7 @@ limitations under the License.
 # %% Import Statements
 # =============================================================================
 # Built-in Modules ------------------------------------------------------------
+from types import SimpleNamespace
 
 # Third-party Modules ---------------------------------------------------------
 import pytest
@@ -55,10 +56,30 @@ def test_ais_ascii_8b_to_6b():
     result = ais_ascii_8b_to_6b(ascii_8b_str)
     assert result == ascii_6b_bs
 
+    # Lower-case characters are converted to upper case, characters that
+    # cannot be represented in 6-bit ASCII are dropped
+    result = ais_ascii_8b_to_6b("Beam me up,\t Scotty!\u00e9")
+    assert result == ascii_6b_bs
+
+    assert ais_ascii_8b_to_6b("") == BitStream()
+
+    # Long strings are packed in bulk rather than character by character
+    for n in (4, 5, 14, 15):
+        result = ais_ascii_8b_to_6b(n * ascii_8b_str)
+        assert result == n * ascii_6b_bs
+
+    # Either side of the bulk packing threshold
+    for n_char in (63, 64, 65):
+        result = ais_ascii_8b_to_6b(n_char * "A")
+        assert result == n_char * BitStream('uint:6=1')
+
 def test_ais_ascii_6b_to_8b():
     result = ais_ascii_6b_to_8b(ascii_6b_bs)
     assert result == ascii_8b_str
 
+    assert ais_ascii_6b_to_8b(BitStream("0b000000111111")) == "@?"
+    assert ais_ascii_6b_to_8b(BitStream()) == ""
+
 def test_ais_message8():
     #### Sample Data
     source_id = 123456789
@@ -81,9 +102,19 @@ def test_ais_message8():
     assert ais_msg_8.payload == payload
 
     assert ais_msg_8.bitstream == ais_msg_8_bs
+    assert ais_msg_8.bitstream is not ais_msg_8.bitstream
 
     assert str(ais_msg_8) == ais_msg_8_str
 
+    # Changes to the payload are reflected in the string representation
+    payload.n_app_data_bytes = 4
+    assert str(ais_msg_8).endswith("Binary Data: 0x000100000000")
+
+    # A payload that is not byte-aligned
+    ais_msg_8.payload = SimpleNamespace(bitstream=BitStream("0xABC"))
+    assert ais_msg_8.bitstream == BitStream("0x201d6f3454ABC")
+    assert str(ais_msg_8).endswith("Binary Data: 0xabc")
+
     # TODO: Add a test for from_vdes_asm()
 
 def test_ais_message21():
@@ -162,6 +193,38 @@ def test_ais_message21():
 
     assert str(ais_msg_21) == ais_msg_21_str
 
+    # Float values of integer fields are truncated, as by bitstring.pack()
+    assert AISMessage21(
+        source_id, aton_type, aton_name, pos_accuracy, lon, lat,
+        [1.0, 2, 3, 4], epf_device_type, 60.0, off_position, aton_status,
+        raim_fl, vaton_fl, assigned_mode_fl).bitstream == ais_msg_bs
+
+    # Every access returns a new, independent and mutable bitstream
+    assert ais_msg_21.bitstream.read('uint:6') == 21
+    assert ais_msg_21.bitstream.read('uint:6') == 21
+
+    bs = ais_msg_21.bitstream
+    bs.append('0b0000')
+    assert ais_msg_21.bitstream == ais_msg_bs
+
+    # In-place changes are picked up too
+    ais_msg_21.dimension[0] = 5
+    assert ais_msg_21.bitstream != ais_msg_bs
+    ais_msg_21.dimension[0] = 1
+    assert ais_msg_21.bitstream == ais_msg_bs
+
+    # Values that compare equal to the cached ones (e.g. 60.0 == 60) reuse
+    # the cached encoding, which must match encoding them from scratch
+    ais_msg_21.time_stamp = 60.0
+    assert ais_msg_21.bitstream == ais_msg_bs
+    ais_msg_21._bytes_cache = None
+    assert ais_msg_21.bitstream == ais_msg_bs
+    ais_msg_21.time_stamp = time_stamp
+
+    # The AtoN name is converted to upper case and truncated to 20 characters
+    ais_msg_21.aton_name = "Jan's Virtual AtoN@@ and more"
+    assert ais_msg_21.bitstream == ais_msg_bs
+
     assert ais_msg_21_from_bs.source_id == source_id
     assert ais_msg_21_from_bs.aton_type == aton_type
     assert ais_msg_21_from_bs.aton_name == aton_name + "@@"
@@ -178,6 +241,36 @@ def test_ais_message21():
     assert ais_msg_21_from_bs.assigned_mode_fl == assigned_mode_fl
     assert ais_msg_21_from_bs.aton_name_extension == aton_name_extension
 
+    # Re-encoding a decoded message must reproduce the original bitstream,
+    # also after the AtoN name has been changed
+    assert ais_msg_21_from_bs.bitstream == ais_msg_bs
+
+    ais_msg_21_from_bs.aton_name = "Another AtoN"
+    assert ais_msg_21_from_bs.bitstream[43:163] == \
+        ais_ascii_8b_to_6b("ANOTHER ATON@@@@@@@@")
+
+def test_ais_message21_encode_batch():
+    msgs = [
+        AISMessage21(
+            992356001 + i, 30, name, 1, 1.34 + i, 51.92 - i, [1, 2, 3, 4], 0,
+            60, 0, 0, 0, 1, 0)
+        for i, name in enumerate(["JAN'S VIRTUAL ATON", "Buoy", "",
+                                  "A name that is far too long"])]
+
+    frames = AISMessage21.encode_batch(msgs)
+
+    assert frames == b"".join(msg.bitstream.tobytes() for msg in msgs)
+
+    # Cached encodings are reused only while they are up to date
+    msgs[1].aton_name = "Beacon"
+    msgs.append(AISMessage21.from_bitstream(msgs[0].bitstream))
+
+    frames = AISMessage21.encode_batch(msgs)
+
+    assert frames == b"".join(msg.bitstream.tobytes() for msg in msgs)
+
+    assert AISMessage21.encode_batch([]) == b""
+
 # =============================================================================
 # %% Main Function
 # =============================================================================